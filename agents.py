@@ -6,10 +6,18 @@ from langchain.agents import AgentExecutor, initialize_agent
 from langchain.agents import AgentType
 from langchain_core.memory import Memory
 from langchain_core.handlers import CallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage, MessageBase
 from langchain_core.models import LanguageModel, ChatModel
 from langchain_core.prompts import CustomPrompt
 from langchain_core.utilities import Tool
 
+from memory import HybridSummaryMemory
+
+# Appended to the running transcript (same prefix) when condensing, so the
+# provider's prompt cache hits everything before it instead of re-processing
+# a brand-new summarization conversation.
+CONDENSE_INSTRUCTION = "Summarize the above into a compact state; keep facts, decisions, and pending items."
+
 
 class TourAssistant(ABC):
     """
@@ -135,6 +143,8 @@ class AdvancedTravelAgent(TourAssistant):
         super().__init__(model, memory, agent_type, verbose)
         self.custom_prompt = hub.load("agent_prompts/advanced_travel")
         self.handler = handler
+        self._executor: Optional[AgentExecutor] = None
+        self.messages: List[MessageBase] = []
 
     def fetch_memory_template(self) -> str:
         """
@@ -175,6 +185,71 @@ class AdvancedTravelAgent(TourAssistant):
 
         """
         self.custom_prompt = CustomPrompt(template)
+        self._executor = None
+
+    def _get_executor(self) -> AgentExecutor:
+        """
+        Returns the cached agent executor, building it on first use.
+
+        Returns:
+            AgentExecutor: The executor bound to the current tools and prompt.
+
+        """
+        if self._executor is None:
+            agent = initialize_agent(
+                tools=self.tools,
+                model=self.model,
+                prompt=self.custom_prompt,
+                memory=self.memory
+            )
+            self._executor = AgentExecutor(agent=agent, tools=self.tools, verbose=self.verbose, memory=self.memory)
+        return self._executor
+
+    def _record_exchange(self, user_input: str, response: str) -> None:
+        """
+        Appends one user/assistant exchange to the running transcript.
+
+        Args:
+            user_input (str): The user's message.
+            response (str): The assistant's reply.
+
+        """
+        self.messages.append(HumanMessage(user_input))
+        self.messages.append(AIMessage(response))
+
+    def _needs_condensing(self) -> bool:
+        """
+        Decides whether the heuristic summary has grown enough to be worth
+        one LLM condensation pass. Only HybridSummaryMemory keeps such a
+        summary; any other memory implementation never condenses.
+
+        Returns:
+            bool: True when the summary exceeds a quarter of the context window.
+
+        """
+        if not isinstance(self.memory, HybridSummaryMemory):
+            return False
+        summary_tokens = self.memory.estimate_tokens(self.memory.summary)
+        return summary_tokens > 0.25 * self.memory.context_window
+
+    def _apply_condensation(self, condensed: str) -> None:
+        """
+        Replaces the memory summary with the model's condensed state and
+        truncates the transcript prefix it covered. The condensed state is
+        kept as the transcript head, so facts captured by earlier
+        condensations stay in the input of every later one and the next
+        condensation call still shares the same message prefix.
+
+        Args:
+            condensed (str): The model-produced compact state.
+
+        """
+        self.memory.summary = condensed
+        # Drop the condense instruction itself, then keep only the recent tail.
+        self.messages.pop()
+        keep = 2 * self.memory.keep_last
+        tail = self.messages[-keep:]
+        self.messages = [AIMessage("Conversation state so far: " + condensed)] + tail
 
     def process_request(self, user_input: str) -> str:
         """
@@ -187,18 +262,39 @@ class AdvancedTravelAgent(TourAssistant):
             str: The agent's response.
 
         """
-        agent = initialize_agent(
-            tools=self.tools, 
-            model=self.model, 
-            prompt=self.custom_prompt,
-            memory=self.memory
-        )
-        executor = AgentExecutor(agent=agent, tools=self.tools, verbose=self.verbose, memory=self.memory)
         inputs = {"query": user_input}
         inputs.update(self.memory.retrieve_memory({}))
-        response = executor.invoke(inputs, {"callbacks": [self.handler]})['result']
+        response = self._get_executor().invoke(inputs, {"callbacks": [self.handler]})['result']
+        self.memory.store_interaction(user_input, response)
+        self._record_exchange(user_input, response)
+        if self._needs_condensing():
+            self.messages.append(HumanMessage(CONDENSE_INSTRUCTION))
+            condensed = self.model.invoke(self.messages)
+            self._apply_condensation(condensed.content)
         return response
 
+    async def process_request_async(self, user_input: str) -> str:
+        """
+        Handles the user’s request asynchronously, overlapping model and tool I/O.
+
+        Args:
+            user_input (str): User-provided text.
+
+        Returns:
+            str: The agent's response.
+
+        """
+        inputs = {"query": user_input}
+        inputs.update(self.memory.retrieve_memory({}))
+        response = await self._get_executor().ainvoke(inputs, {"callbacks": [self.handler]})
+        self.memory.store_interaction(user_input, response['result'])
+        self._record_exchange(user_input, response['result'])
+        if self._needs_condensing():
+            self.messages.append(HumanMessage(CONDENSE_INSTRUCTION))
+            condensed = await self.model.ainvoke(self.messages)
+            self._apply_condensation(condensed.content)
+        return response['result']
+
     def append_tool(self, tool: Tool) -> None:
         """
         Adds a new tool to the assistant’s toolkit.
@@ -208,6 +304,7 @@ class AdvancedTravelAgent(TourAssistant):
 
         """
         self.tools.append(tool)
+        self._executor = None
 
     def reset_memory(self) -> None:
         """
@@ -1,16 +1,22 @@
-from typing import Dict, Any
+from typing import Any, Tuple
 
 import folium
+import streamlit as st
 
-def generate_route_map(route: Dict[str, Any]) -> folium.Map:
+
+@st.cache_data(show_spinner=False)
+def generate_route_map(route: Tuple[Tuple[float, float], ...]) -> folium.Map:
     # Initialize the map centered on the first point in the route
     base_map = folium.Map(location=route[0], zoom_start=12, tiles='Stamen Terrain')
 
     # Add the route as a polyline
     folium.PolyLine(locations=route, color="blue", weight=4, opacity=0.7).add_to(base_map)
 
-    # Calculate the bounds of the route for proper map zooming
-    route_bounds = base_map.get_bounds()
+    # Compute the route bounds in one pass over the coordinates rather than
+    # having folium re-walk every child of the map
+    lats = [point[0] for point in route]
+    lons = [point[1] for point in route]
+    route_bounds = [[min(lats), min(lons)], [max(lats), max(lons)]]
 
     # Adjust map view to fit the route bounds
     base_map.fit_bounds(route_bounds)
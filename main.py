@@ -1,17 +1,25 @@
+import asyncio
 import os
+import threading
 import uuid
+from collections import deque
+
 import streamlit as st
+import uvloop
 from langchain.agents import AgentType
-from langchain.memory import ConversationSummaryMemory
 from langchain_openai import ChatOpenAI
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 from streamlit_folium import st_folium
 from langchain.agents import load_tools
 
 from agents import AdvancedTravelAgent
-from memory import CustomCallbackHandler
+from memory import CustomCallbackHandler, HybridSummaryMemory, summarize_message
 from utils import InterestLocator, RoutePathfinder
 from helper import generate_route_map
 
+# Use uvloop for the asyncio event loop driving agent requests
+uvloop.install()
+
 # Streamlit setup and app configuration
 st.set_page_config(page_title="Intelligent Trip Planner", page_icon="🌍", layout="centered",
                    initial_sidebar_state="auto", menu_items=None)
@@ -21,9 +29,27 @@ st.info(
     "Welcome to your AI-powered travel assistant! Plan your trips with ease.",
     icon="🗺️")
 
+# Keep rerun cost bounded regardless of conversation length
+MAX_CHAT_MESSAGES = 40
+
 # Initialize chat message history in session state
 if "messages" not in st.session_state:
-    st.session_state.messages = [{"role": "assistant", "content": "How can I assist you in planning your trip today?"}]
+    st.session_state.messages = deque(
+        [{"role": "assistant", "content": "How can I assist you in planning your trip today?"}],
+        maxlen=MAX_CHAT_MESSAGES)
+    st.session_state.summary = ""
+
+
+def record_message(message):
+    """Appends to the bounded chat history, folding the message a full buffer
+    would evict into the rolling summary so its facts aren't lost."""
+    messages = st.session_state.messages
+    if len(messages) == messages.maxlen:
+        evicted = messages.popleft()
+        compressed = summarize_message(evicted.get("content", ""))
+        if compressed:
+            st.session_state.summary = (st.session_state.summary + ' ' + compressed).strip()
+    messages.append(message)
 
 # Set up the chat engine with memory and tools
 if "chat_engine" not in st.session_state:
@@ -32,9 +58,9 @@ if "chat_engine" not in st.session_state:
         raise ValueError("The OpenAI API key must be set as an environment variable.")
 
     # Initialize language model with memory and callback handler
-    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0, openai_api_key=openai_api_key)
-    memory = ConversationSummaryMemory(memory_key="chat_log", llm=llm, max_token_limit=10, verbose=True)
-    callback_handler = CustomCallbackHandler(session_state=st.session_state)
+    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0, streaming=True, openai_api_key=openai_api_key)
+    memory = HybridSummaryMemory(memory_key="chat_log", context_window=4096, keep_last=10)
+    callback_handler = CustomCallbackHandler(session_state=st.session_state, record=record_message)
     travel_agent = AdvancedTravelAgent(llm=llm, memory=memory, agent_type=AgentType.CONVERSATIONAL_REACT_DESCRIPTION,
                                        verbose=True, handler=callback_handler)
 
@@ -48,34 +74,69 @@ if "chat_engine" not in st.session_state:
 
 # Capture user input and add to chat history
 if user_input := st.chat_input("Type your question here"):
-    st.session_state.messages.append({"role": "user", "content": user_input})
+    record_message({"role": "user", "content": user_input})
+
+# Surface context that has been rolled out of the bounded buffer
+if st.session_state.summary:
+    with st.expander("Earlier context"):
+        st.write(st.session_state.summary)
 
 # Display all prior messages in the chat interface
-for message in st.session_state.messages:
+for index, message in enumerate(st.session_state.messages):
     with st.chat_message(message["role"]):
         st.write(message["content"])
 
     # Display map if 'geocode_points' are available in the message
     if 'geocode_points' in message:
-        route_points = message['geocode_points']
-        map_key = message['map_key']
+        # Tuple-ify so identical routes hash to the same st.cache_data entry
+        route_points = tuple(map(tuple, message['geocode_points']))
         map_view = generate_route_map(route_points)
-        _ = st_folium(map_view, key=map_key)
+        if index == len(st.session_state.messages) - 1:
+            # Only the newest map needs the interactive JS bridge
+            _ = st_folium(map_view, key=message['map_key'])
+        else:
+            # Historical maps are read-only; static HTML skips the
+            # bidirectional st_folium component and its rerun cycle
+            st.components.v1.html(map_view.get_root().render(), height=400)
 
 # Generate assistant response if last message is from user
 if st.session_state.messages[-1]["role"] == "user":
     with st.chat_message("assistant"):
-        with st.spinner("Processing your request..."):
-            response = st.session_state.chat_engine.process_request(user_input)
-            
-            # Display route map if geocode points are present
-            if 'geocode_points' in st.session_state.messages[-1]:
-                route_points = st.session_state.messages[-1]['geocode_points']
-                map_key = str(uuid.uuid4())
-                map_view = generate_route_map(route_points)
-                _ = st_folium(map_view, key=map_key)
-                st.session_state.messages[-1]['map_key'] = map_key
-
-            # Display and store assistant response
+        handler = st.session_state.chat_engine.handler
+        result_holder = {}
+
+        def run_agent():
+            try:
+                result_holder["response"] = asyncio.run(
+                    st.session_state.chat_engine.process_request_async(user_input))
+            except Exception as error:
+                result_holder["error"] = error
+            finally:
+                handler.end_stream()
+
+        # Run the agent in the background and surface tokens as they arrive,
+        # so perceived latency is time-to-first-token rather than the full
+        # generation time. The script-run context must follow the thread or
+        # the callback handler's session_state access would raise.
+        agent_thread = threading.Thread(target=run_agent)
+        add_script_run_ctx(agent_thread)
+        agent_thread.start()
+        streamed = st.write_stream(handler.token_iterator())
+        agent_thread.join()
+
+        if "error" in result_holder:
+            raise result_holder["error"]
+        response = result_holder["response"]
+
+        # Display route map if geocode points are present
+        if 'geocode_points' in st.session_state.messages[-1]:
+            route_points = tuple(map(tuple, st.session_state.messages[-1]['geocode_points']))
+            map_key = str(uuid.uuid4())
+            map_view = generate_route_map(route_points)
+            _ = st_folium(map_view, key=map_key)
+            st.session_state.messages[-1]['map_key'] = map_key
+
+        # Fall back to a plain write if the model produced no streamed tokens
+        if not streamed:
             st.write(response)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+        record_message({"role": "assistant", "content": response})
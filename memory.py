@@ -1,25 +1,184 @@
-from typing import Dict, Union, List, Any
+import queue
+import re
+from collections import deque
+from typing import Callable, Dict, Union, List, Any, Iterator, Optional
+
 from langchain.callbacks.base import CallbackHandlerBase
 from langchain_core.agents import AgentResult, AgentEvent
+from langchain_core.memory import Memory
 from langchain_core.messages import MessageBase
 from langchain_core.results import ModelResult
 from streamlit.runtime.state import StateProxy
 
+# Marks the end of a token stream in CustomCallbackHandler's queue.
+_STREAM_END = object()
+
+# Sentences carrying facts or decisions worth keeping when older turns are compressed.
+_SALIENT_PATTERN = re.compile(
+    r"[^.!?\n]*\b(?:prefer|want|need|budget|decide|book|plan|visit|avoid|stay|leave|arrive)\w*\b[^.!?\n]*[.!?]?",
+    re.IGNORECASE)
+
+
+def summarize_message(message: str) -> str:
+    """
+    Extracts the fact/decision-bearing sentences from a message, falling back
+    to its first sentence when nothing salient is found.
+
+    Args:
+        message (str): Message text to compress.
+
+    Returns:
+        str: The compressed form of the message.
+
+    """
+    salient = _SALIENT_PATTERN.findall(message)
+    if salient:
+        return ' '.join(fragment.strip() for fragment in salient)
+    first_sentence = re.split(r'(?<=[.!?])\s', message.strip(), maxsplit=1)[0]
+    return first_sentence
+
+
+class HybridSummaryMemory(Memory):
+    """
+    Conversation memory that keeps the most recent turns verbatim and compresses
+    older turns with a heuristic (no-LLM) summarizer, so no extra model call is
+    spent re-summarizing on every turn.
+    """
+
+    def __init__(self, memory_key: str = "chat_log", context_window: int = 4096, keep_last: int = 10) -> None:
+        """
+        Initializes the hybrid memory with a bounded recency buffer.
+
+        Args:
+            memory_key (str): Key under which memory is exposed to the prompt.
+            context_window (int): Approximate token budget for stored context.
+            keep_last (int): Number of most recent messages kept verbatim.
+
+        """
+        self.memory_key = memory_key
+        self.context_window = context_window
+        self.keep_last = keep_last
+        self.summary = ""
+        self.recent: deque = deque()
+        self.prompt_template: Optional[str] = None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Cheap token estimate (~4 characters per token); avoids a tokenizer dependency.
+
+        Args:
+            text (str): Text to measure.
+
+        Returns:
+            int: Approximate token count.
+
+        """
+        return len(text) // 4
+
+    def _condense(self) -> None:
+        """
+        Folds the oldest buffered messages into the running summary until the
+        estimated size fits back under 80% of the context window.
+
+        """
+        budget = 0.8 * self.context_window
+        while len(self.recent) > self.keep_last and self._current_size() > budget:
+            evicted = self.recent.popleft()
+            compressed = summarize_message(evicted)
+            if compressed:
+                self.summary = (self.summary + ' ' + compressed).strip()
+
+    def _current_size(self) -> int:
+        """
+        Estimates the token footprint of the summary plus the recency buffer.
+
+        Returns:
+            int: Approximate token count of stored context.
+
+        """
+        return self.estimate_tokens(self.summary) + sum(self.estimate_tokens(m) for m in self.recent)
+
+    def store_interaction(self, user_input: str, response: str) -> None:
+        """
+        Records one user/assistant exchange, compressing older turns if the
+        buffer has outgrown its budget.
+
+        Args:
+            user_input (str): The user's message.
+            response (str): The assistant's reply.
+
+        """
+        self.recent.append(f"Human: {user_input}")
+        self.recent.append(f"AI: {response}")
+        if self._current_size() > 0.8 * self.context_window:
+            self._condense()
+
+    def retrieve_memory(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Builds the memory variables handed to the agent prompt.
+
+        Args:
+            inputs (Dict[str, Any]): Chain inputs (unused).
+
+        Returns:
+            Dict[str, str]: Summary plus verbatim recent turns under the memory key.
+
+        """
+        parts = []
+        if self.summary:
+            parts.append(self.summary)
+        parts.extend(self.recent)
+        return {self.memory_key: '\n'.join(parts)}
+
+    def get_prompt_template(self) -> Optional[str]:
+        """
+        Retrieves the memory prompt template, if one has been set.
+
+        Returns:
+            Optional[str]: The memory prompt template.
+
+        """
+        return self.prompt_template
+
+    def set_prompt_template(self, template: str) -> None:
+        """
+        Sets the memory prompt template.
+
+        Args:
+            template (str): The new memory prompt template.
+
+        """
+        self.prompt_template = template
+
+    def clear_data(self) -> None:
+        """
+        Discards the summary and all buffered turns.
+
+        """
+        self.summary = ""
+        self.recent.clear()
+
+
 class CustomCallbackHandler(CallbackHandlerBase):
     """
     Custom callback handler for handling events in the language model interactions.
     """
 
-    def __init__(self, session_state: StateProxy) -> None:
+    def __init__(self, session_state: StateProxy, record: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
         """
         Initializes the callback handler with the session state for Streamlit.
 
         Args:
             session_state (StateProxy): Streamlit session state to manage app state.
+            record (Optional[Callable]): Function used to append a message to the
+                chat history; defaults to a plain session-state append.
 
         """
         super(CustomCallbackHandler, self).__init__()
         self.session_state = session_state
+        self._record = record
+        self._token_queue: queue.Queue = queue.Queue()
 
     def on_model_start(self, data: Dict[str, Any], prompts: List[str], **extra_args: Any) -> Any:
         """
@@ -48,14 +207,37 @@ class CustomCallbackHandler(CallbackHandlerBase):
     def on_model_token_received(self, token: str, **extra_args: Any) -> Any:
         """
         Runs when a new token is received from the model (used when streaming).
+        Forwards the token to the UI stream queue.
 
         Args:
             token (str): The received token.
             **extra_args (Any): Extra parameters.
 
         """
+        self._token_queue.put_nowait(token)
         return super(CustomCallbackHandler, self).on_model_token_received(token, **extra_args)
 
+    def end_stream(self) -> None:
+        """
+        Signals that no further tokens will arrive for the current turn.
+
+        """
+        self._token_queue.put_nowait(_STREAM_END)
+
+    def token_iterator(self) -> Iterator[str]:
+        """
+        Yields streamed tokens as they arrive, until end_stream() is called.
+
+        Returns:
+            Iterator[str]: Tokens for st.write_stream.
+
+        """
+        while True:
+            token = self._token_queue.get()
+            if token is _STREAM_END:
+                return
+            yield token
+
     def on_model_complete(self, result: ModelResult, **extra_args: Any) -> Any:
         """
         Called upon model completion.
@@ -133,8 +315,15 @@ class CustomCallbackHandler(CallbackHandlerBase):
 
         """
         if isinstance(output, dict) and 'geocode_data' in output:
-            geocode_data = {'geocode_data': output['geocode_data'].copy()}
-            self.session_state.messages.append(geocode_data)
+            # Stash a reference rather than copying on the callback path; the
+            # render step tuple-ifies the points before any reuse. Goes through
+            # the record callable so a full history buffer still folds whatever
+            # it evicts into the rolling summary.
+            geocode_data = {'geocode_data': output['geocode_data']}
+            if self._record is not None:
+                self._record(geocode_data)
+            else:
+                self.session_state.messages.append(geocode_data)
             output['geocode_data'] = ""
             return output
         return super(CustomCallbackHandler, self).on_tool_complete(output, **extra_args)
@@ -1,20 +1,100 @@
 import ast
+import asyncio
+import functools
 import json
 import os
 import pprint
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 
+import httpx
+import orjson
 import requests
+from diskcache import Cache
 from geopy.extra.rate_limiter import RateLimiter
 from geopy.geocoders import Nominatim
 from langchain.tools import BaseTool
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from urllib3.util.retry import Retry
 
 SEARCH_RADIUS = 80000  # Adjusted radius to change coverage slightly
 FSQ_SEARCH_API = "https://api.foursquare.com/v3/places/search"
 FSQ_DETAILS_API = "https://api.foursquare.com/v3/places/{}/tips"
 BING_ROUTE_API = "http://dev.virtualearth.net/REST/V1/Routes/{}?"
 
+# API keys are resolved once at import; the per-call guards below only
+# check the cached value so a missing key still surfaces as a tool failure.
+FSQ_API_KEY = os.getenv('FSQ_API_KEY')
+FSQ_HEADERS = {
+    "accept": "application/json",
+    "Authorization": FSQ_API_KEY
+}
+BING_API_KEY = os.getenv('BING_API_KEY')
+
+# Shared session so repeat API calls reuse pooled keep-alive connections
+# instead of paying a fresh TCP + TLS handshake each time.
+REQUEST_TIMEOUT = (3.05, 10)
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                       max_retries=Retry(total=2, backoff_factor=0.2))
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=0.2, max=2.0),
+       retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout)))
+def _get_with_retry(url: str, **kwargs: Any) -> requests.Response:
+    """Issues a GET through the pooled session, retrying transient failures
+    with jittered exponential backoff so a blip doesn't fail the whole tool
+    call (and cost the agent an LLM re-attempt).
+
+    Args:
+        url (str): Request URL
+        **kwargs (Any): Extra arguments passed to Session.get
+
+    Returns:
+        response (requests.Response): The HTTP response
+    """
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    return _SESSION.get(url, **kwargs)
+
+
+# Async counterpart of _SESSION, used by the tools' _arun paths. Each chat
+# turn runs under a fresh asyncio.run() loop, and an AsyncClient's pooled
+# connections are bound to the loop they were opened on — reusing one client
+# across loops raises "Event loop is closed" on the second turn. So clients
+# are created lazily, one per running loop, and entries for closed loops are
+# pruned as new loops appear.
+_CLIENTS: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Returns the httpx client for the current event loop, creating it on
+    first use and discarding clients whose loops have since closed.
+
+    Returns:
+        client (httpx.AsyncClient): Client bound to the running loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None:
+        for stale_loop in [known for known in _CLIENTS if known.is_closed()]:
+            del _CLIENTS[stale_loop]
+        client = httpx.AsyncClient(http2=True, timeout=10.0, limits=httpx.Limits(max_connections=32))
+        _CLIENTS[loop] = client
+    return client
+
+# On-disk cache so POI and route lookups survive restarts; entries expire
+# after a day to stay reasonably fresh.
+_CACHE = Cache("./.tool_cache")
+
+# One geocoder for the process so the RateLimiter clock spans calls and
+# Nominatim's 1-request/second policy is actually honored.
+_GEOCODER = Nominatim(user_agent="interest_locator_tool")
+_GEOCODE = RateLimiter(_GEOCODER.geocode, min_delay_seconds=1, max_retries=2, error_wait_seconds=2.0)
+
 class InterestLocator(BaseTool):
     """
     Tool for retrieving points of interest in a specified location. It provides descriptions for local attractions,
@@ -38,17 +118,87 @@ class InterestLocator(BaseTool):
             output (dict): Places of interest with descriptions
         """
         location_details = fetch_location_data(location)
-        points_of_interest = fetch_places_of_interest(location_details.latitude, location_details.longitude, SEARCH_RADIUS)
+        points_of_interest = _cached_places(round(location_details.latitude, 4),
+                                            round(location_details.longitude, 4), SEARCH_RADIUS)
         output = {"output": points_of_interest}
         return output
 
-    def _arun(self, location: str):
-        """Asynchronous support is not implemented.
+    async def _arun(self, location: str) -> Dict[str, str]:
+        """Performs an asynchronous search for places of interest around the given location.
+
+        Runs the cached sync helpers in a thread so the async path shares the
+        session, disk, and tip caches with _run; the tip fan-out inside
+        _places_lookup already overlaps its requests.
 
         Args:
             location (str): location input from the agent
+
+        Returns:
+            output (dict): Places of interest with descriptions
         """
-        raise NotImplementedError("Asynchronous operation is not supported for this tool.")
+        location_details = await asyncio.to_thread(fetch_location_data, location)
+        points_of_interest = await asyncio.to_thread(_cached_places, round(location_details.latitude, 4),
+                                                     round(location_details.longitude, 4), SEARCH_RADIUS)
+        output = {"output": points_of_interest}
+        return output
+
+
+_PLACES_CACHE: Dict[tuple, str] = {}
+
+
+def _cached_places(latitude: float, longitude: float, radius: int) -> str:
+    """Caches fetch_places_of_interest results by rounded coordinates so
+    follow-up questions about the same city skip the network entirely.
+    Failed lookups are not cached, so a transient API error doesn't stick.
+
+    Args:
+        latitude (float): Latitude rounded to 4 decimals
+        longitude (float): Longitude rounded to 4 decimals
+        radius (int): Search radius in meters
+
+    Returns:
+        points_info (str): Concise descriptions of nearby points of interest
+    """
+    key = (latitude, longitude, radius)
+    if key not in _PLACES_CACHE:
+        points_info = fetch_places_of_interest(latitude, longitude, radius)
+        if points_info == "No information available.":
+            return points_info
+        _PLACES_CACHE[key] = points_info
+    return _PLACES_CACHE[key]
+
+
+@_CACHE.memoize(expire=86400)
+def _places_lookup(latitude: float, longitude: float, radius: int) -> str:
+    """Performs the actual Foursquare search + tip fan-out; raises on failure
+    so only successful lookups land in the on-disk cache.
+
+    Args:
+        latitude (float): Latitude of the location
+        longitude (float): Longitude of the location
+        radius (int): Search radius in meters
+
+    Returns:
+        points_info (str): Concise descriptions of nearby points of interest
+    """
+    if not FSQ_API_KEY:
+        raise ValueError("Foursquare API key is required")
+
+    params = {
+        "ll": f"{latitude},{longitude}",
+        "radius": radius,
+        "sort": "DISTANCE",
+        "limit": 8
+    }
+    response = _get_with_retry(FSQ_SEARCH_API, headers=FSQ_HEADERS, params=params)
+    response.raise_for_status()
+
+    places = response.json().get('results', [])
+    # Fan the tip lookups out so the total cost is one round trip, not one per place
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        infos = list(executor.map(lambda place: compile_place_info(place['name'], place['fsq_id']), places))
+    points_info = '\n'.join(infos)
+    return points_info
 
 
 def fetch_places_of_interest(latitude: float, longitude: float, radius: int) -> str:
@@ -63,31 +213,13 @@ def fetch_places_of_interest(latitude: float, longitude: float, radius: int) ->
         points_info (str): Concise descriptions of nearby points of interest
     """
     try:
-        api_key = os.getenv('FSQ_API_KEY')
-        if not api_key:
-            raise ValueError("Foursquare API key is required")
-
-        headers = {
-            "accept": "application/json",
-            "Authorization": api_key
-        }
-        params = {
-            "ll": f"{latitude},{longitude}",
-            "radius": radius,
-            "sort": "DISTANCE",
-            "limit": 8
-        }
-        response = requests.get(FSQ_SEARCH_API, headers=headers, params=params)
-        response.raise_for_status()
-        
-        places = response.json().get('results', [])
-        points_info = '\n'.join(compile_place_info(place['name'], place['fsq_id']) for place in places)
-        return points_info
+        return _places_lookup(latitude, longitude, radius)
     except Exception as error:
         print(f"Error while fetching places of interest: {error}")
         return "No information available."
 
 
+@functools.lru_cache(maxsize=256)
 def fetch_location_data(location: str) -> Nominatim:
     """Uses the Nominatim geocoder to fetch latitude and longitude details for a location.
 
@@ -98,11 +230,9 @@ def fetch_location_data(location: str) -> Nominatim:
         location_details (Nominatim): Geopy location details
     """
     location = location.strip("location=")
-    geolocator = Nominatim(user_agent="interest_locator_tool")
-    rate_limiter = RateLimiter(geolocator.geocode, min_delay_seconds=1)
 
     try:
-        location_details = rate_limiter(location)
+        location_details = _GEOCODE(location)
         if location_details:
             return location_details
         else:
@@ -112,6 +242,30 @@ def fetch_location_data(location: str) -> Nominatim:
         raise
 
 
+@functools.lru_cache(maxsize=256)
+def _tips_lookup(name: str, fsq_id: str) -> str:
+    """Performs the actual Foursquare tip fetch; raises on failure so only
+    successful lookups are memoized.
+
+    Args:
+        name (str): Name of the location
+        fsq_id (str): Unique Foursquare ID for the location
+
+    Returns:
+        info (str): Description of the location's points of interest
+    """
+    url = FSQ_DETAILS_API.format(fsq_id)
+    if not FSQ_API_KEY:
+        raise ValueError("Foursquare API key is required")
+
+    response = _get_with_retry(url, headers=FSQ_HEADERS, params={"sort": "POPULAR", "limit": 3})
+    response.raise_for_status()
+
+    tips = response.json()
+    info = name + ': ' + ' '.join(tip.get('text', '') for tip in tips)
+    return info
+
+
 def compile_place_info(name: str, fsq_id: str) -> str:
     """Gathers additional details for a specific place using Foursquare.
 
@@ -123,26 +277,44 @@ def compile_place_info(name: str, fsq_id: str) -> str:
         info (str): Description of the location's points of interest
     """
     try:
-        url = FSQ_DETAILS_API.format(fsq_id)
-        api_key = os.getenv('FSQ_API_KEY')
-        if not api_key:
-            raise ValueError("Foursquare API key is required")
-        
-        headers = {
-            "accept": "application/json",
-            "Authorization": api_key
-        }
-        response = requests.get(url, headers=headers, params={"sort": "POPULAR", "limit": 3})
-        response.raise_for_status()
-        
-        tips = response.json()
-        info = name + ': ' + ' '.join(tip.get('text', '') for tip in tips)
-        return info
+        return _tips_lookup(name, fsq_id)
     except Exception as error:
         print(f"Error retrieving place information: {error}")
         return f"{name}: No further information available."
 
 
+# Keyword-to-mode dispatch table for get_transport_mode; order preserves the
+# original precedence (walk before bike before transit).
+_MODE_MAP = {
+    'walk': 'Walking',
+    'bike': 'Bicycling',
+    'cycle': 'Bicycling',
+    'transit': 'Transit',
+    'bus': 'Transit',
+    'train': 'Transit',
+}
+
+
+def _parse_tool_input(input_data: Any) -> Dict[str, Any]:
+    """Decodes a tool input the agent may hand over as a string.
+
+    Tries orjson first (fast path for JSON-shaped input) and falls back to
+    ast.literal_eval for Python-literal syntax such as single-quoted dicts.
+
+    Args:
+        input_data (Any): Raw tool input, either a dict or its string form
+
+    Returns:
+        input_data (dict): The decoded input
+    """
+    if isinstance(input_data, str):
+        try:
+            input_data = orjson.loads(input_data)
+        except Exception:
+            input_data = ast.literal_eval(input_data)
+    return input_data
+
+
 class RoutePathfinder(BaseTool):
     name = "Route Pathfinder"
     description = (
@@ -154,52 +326,77 @@ class RoutePathfinder(BaseTool):
     )
 
     def _run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        if isinstance(input_data, str):
-            input_data = ast.literal_eval(input_data)
+        input_data = _parse_tool_input(input_data)
         transport_mode = self.get_transport_mode(input_data.get('transport_mode', 'driving'))
-        locations = input_data.get('locations', [])
+        locations = tuple(input_data.get('locations', []))
         route = generate_route(locations, transport_mode)
         return route
 
-    def _arun(self, locations: List[str], transport_mode: str) -> None:
-        raise NotImplementedError("Asynchronous operations are unsupported.")
+    async def _arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        input_data = _parse_tool_input(input_data)
+        transport_mode = self.get_transport_mode(input_data.get('transport_mode', 'driving'))
+        locations = tuple(input_data.get('locations', []))
+        route = await generate_route_async(locations, transport_mode)
+        return route
 
     @staticmethod
     def get_transport_mode(transport_mode: str) -> str:
         transport_mode = transport_mode.lower().strip()
-        if 'walk' in transport_mode:
-            return 'Walking'
-        elif 'bike' in transport_mode or 'cycle' in transport_mode:
-            return 'Bicycling'
-        elif 'transit' in transport_mode or 'bus' in transport_mode or 'train' in transport_mode:
-            return 'Transit'
-        else:
-            return 'Driving'
+        return next((mode for keyword, mode in _MODE_MAP.items() if keyword in transport_mode), 'Driving')
 
 
-def generate_route(locations: List[str], mode: str) -> Dict[str, Any]:
-    api_key = os.getenv('BING_API_KEY')
-    if not api_key:
+def build_route_url(locations: List[str], mode: str) -> str:
+    if not BING_API_KEY:
         raise ValueError("Bing Maps API key is required")
 
-    route_url = BING_ROUTE_API.format(mode)
-    for index, location in enumerate(locations):
-        encoded_location = urllib.parse.quote(location, safe='')
-        route_url += f"&wp.{index}=" + encoded_location
+    params = [(f"wp.{index}", location) for index, location in enumerate(locations)]
+    params.append(("key", BING_API_KEY))
+    query = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
+    return BING_ROUTE_API.format(mode) + "&" + query
+
+
+def parse_route_response(route_data: Dict[str, Any]) -> Dict[str, Any]:
+    itinerary = route_data["resourceSets"][0]["resources"][0]["routeLegs"][0]["itineraryItems"]
+    # Single pass over the itinerary builds both the directions and the points
+    directions = []
+    geo_points = []
+    for item in itinerary:
+        directions.append("- " + item["instruction"]["text"])
+        geo_points.append(item["maneuverPoint"]["coordinates"])
+
+    route = {"output": '\n'.join(directions), 'geocode_points': geo_points}
+    return route
+
+
+@_CACHE.memoize(expire=86400)
+def generate_route(locations: List[str], mode: str) -> Dict[str, Any]:
+    route_url = build_route_url(locations, mode)
+    print("Requesting route from URL:", route_url)
+
+    try:
+        response = _get_with_retry(route_url)
+        response.raise_for_status()
+        return parse_route_response(orjson.loads(response.content))
+    except Exception as error:
+        raise ConnectionError(f"Route retrieval error: {error}")
+
+
+async def generate_route_async(locations: List[str], mode: str) -> Dict[str, Any]:
+    # memoize() doesn't wrap coroutines, so the async path checks the same
+    # on-disk cache by hand with an explicit key.
+    cache_key = ('route', tuple(locations), mode)
+    cached = _CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-    route_url += "&key=" + api_key
+    route_url = build_route_url(locations, mode)
     print("Requesting route from URL:", route_url)
 
     try:
-        response = requests.get(route_url)
+        response = await _get_client().get(route_url)
         response.raise_for_status()
-        
-        route_data = response.json()
-        itinerary = route_data["resourceSets"][0]["resources"][0]["routeLegs"][0]["itineraryItems"]
-        directions = ["- " + item["instruction"]["text"] for item in itinerary]
-        geo_points = [item["maneuverPoint"]["coordinates"] for item in itinerary]
-        
-        route = {"output": '\n'.join(directions), 'geocode_points': geo_points}
+        route = parse_route_response(orjson.loads(response.content))
+        _CACHE.set(cache_key, route, expire=86400)
         return route
     except Exception as error:
         raise ConnectionError(f"Route retrieval error: {error}")